@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta
-from io import BytesIO
 from typing import Dict, List, Any, Optional, Tuple
 
 import pyarrow as pa
@@ -162,6 +161,10 @@ class AggregatorService:
 
         logger.debug(f"Created {len(grouped_files)} time groups")
 
+        # Every file with a valid name is in a group, so the latest group time is the
+        # latest rounded file time
+        latest_group_time = max(grouped_files, default=None)
+
         # Process each group
         for group_time, group_files in grouped_files.items():
             if not group_files:
@@ -175,19 +178,7 @@ class AggregatorService:
             next_period = group_time + timedelta(minutes=frequency_minutes)
 
             # Check if there's at least one file from the next time period
-            has_next_period_file = False
-            for file_path in files:
-                file_dt = self._extract_datetime_from_filename(file_path)
-                if file_dt:
-                    file_dt = (
-                        timezone.localize(file_dt)
-                        if file_dt.tzinfo is None
-                        else file_dt
-                    )
-                    rounded_time = self._get_rounded_time(file_dt, frequency_minutes)
-                    if rounded_time >= next_period:
-                        has_next_period_file = True
-                        break
+            has_next_period_file = latest_group_time >= next_period
 
             if not has_next_period_file:
                 logger.info(
@@ -290,7 +281,7 @@ class AggregatorService:
                 data = storage.read_bytes(file_path)
 
                 if table is None:
-                    table = pq.read_table(BytesIO(data))
+                    table = pq.read_table(pa.BufferReader(data))
                     if table.num_rows <= 0:
                         logger.warning(
                             f"Empty DataFrame for {provider_name}/{service_type} at {group_time}"
@@ -299,7 +290,7 @@ class AggregatorService:
                 else:
                     try:
                         table = pa.concat_tables(
-                            [table, pq.read_table(BytesIO(data))],
+                            [table, pq.read_table(pa.BufferReader(data))],
                             unicode_promote_options="default",
                         )
                     except Exception as e:
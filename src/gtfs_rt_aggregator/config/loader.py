@@ -1,4 +1,6 @@
+import os
 import tomllib
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Union, BinaryIO
 
@@ -18,6 +20,9 @@ def load_config_from_toml(toml_path: Union[str, Path]) -> GtfsRtConfig:
     """
     Load configuration from a TOML file.
 
+    Parsed configurations are cached per file until the file's modification
+    time or size changes. Each call returns its own copy of the configuration.
+
     @param toml_path: Path to the TOML file
     @return GtfsRtConfig object
     @raises FileNotFoundError: If the file doesn't exist
@@ -25,12 +30,14 @@ def load_config_from_toml(toml_path: Union[str, Path]) -> GtfsRtConfig:
     """
     logger.info(f"Loading configuration from TOML file: {toml_path}")
     try:
-        with open(toml_path, "rb") as f:
-            config = load_config_from_toml_file(f)
-            logger.info(
-                f"Successfully loaded configuration with {len(config.providers)} providers"
-            )
-            return config
+        stat = os.stat(toml_path)
+        config = _load_config_cached(
+            os.path.realpath(toml_path), stat.st_mtime_ns, stat.st_size
+        )
+        logger.info(
+            f"Successfully loaded configuration with {len(config.providers)} providers"
+        )
+        return config.model_copy(deep=True)
     except FileNotFoundError:
         logger.error(f"Configuration file not found: {toml_path}")
         raise
@@ -41,6 +48,25 @@ def load_config_from_toml(toml_path: Union[str, Path]) -> GtfsRtConfig:
         raise
 
 
+@lru_cache(maxsize=32)
+def _load_config_cached(toml_path: str, mtime_ns: int, size: int) -> GtfsRtConfig:
+    """
+    Load and cache configuration from a TOML file.
+
+    @param toml_path: Absolute path to the TOML file
+    @param mtime_ns: Modification time of the file, part of the cache key
+    @param size: Size of the file, part of the cache key
+    @return GtfsRtConfig object
+    """
+    with open(toml_path, "rb") as f:
+        return load_config_from_toml_file(f)
+
+
+def clear_config_cache():
+    """Clear the cache of configurations loaded by load_config_from_toml."""
+    _load_config_cached.cache_clear()
+
+
 def load_config_from_toml_file(toml_file: BinaryIO) -> GtfsRtConfig:
     """
     Load configuration from a TOML file object.
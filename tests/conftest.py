@@ -0,0 +1,17 @@
+"""Shared pytest configuration for the GTFS-RT aggregator tests."""
+
+import os
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--real-http",
+        action="store_true",
+        default=False,
+        help="Serve the mock GTFS-RT feeds over a local HTTP server instead of in-process",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("--real-http"):
+        os.environ["MOCK_SERVER_REAL_HTTP"] = "1"
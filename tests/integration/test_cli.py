@@ -1,71 +1,65 @@
 """Test the CLI functionality for the GTFS-RT aggregator."""
 
-import os
 import sys
 import unittest
 from io import StringIO
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+import pytest
+
+from src.gtfs_rt_aggregator.config.loader import clear_config_cache
 from src.gtfs_rt_aggregator.utils.cli import main
-from tests.mocks import MockServerManager
+from tests.mocks import get_mock_server
 
 
+@pytest.mark.xdist_group("config_mutation")
 class TestCli(unittest.TestCase):
     """Test the CLI functionality."""
 
+    # Original test config content, kept in memory while the port is patched
+    _orig_config_bytes = None
+
     @classmethod
     def setUpClass(cls):
-        """Start the mock server before tests."""
-        cls.server_manager = MockServerManager()
-        success = cls.server_manager.start()
-        if not success:
-            raise RuntimeError("Could not start mock server")
-        # Get the actual port that was used
+        """Point the test config at the shared mock server for the duration of the class."""
+        cls.server_manager = get_mock_server()
+        # Get the actual port that was assigned
         cls.mock_server_port = cls.server_manager.port
-
-        # Update the test config to use the actual port
         cls._update_test_config_port(cls.mock_server_port)
 
+        # Start with an empty configuration cache
+        clear_config_cache()
+
     @classmethod
     def tearDownClass(cls):
-        """Stop the mock server after tests."""
-        cls.server_manager.stop()
-
-        # Restore the original test config
+        """Restore the original test config."""
         cls._restore_test_config()
+        clear_config_cache()
 
-    @staticmethod
-    def _update_test_config_port(port):
+    @classmethod
+    def _update_test_config_port(cls, port):
         """Update the test config file to use the actual port."""
-        config_path = os.path.join("tests", "data", "test_config.toml")
-        with open(config_path, "r") as f:
-            content = f.read()
+        config_path = Path("tests", "data", "test_config.toml")
+        content = config_path.read_bytes()
 
         # Replace the port in the URLs
-        updated_content = content.replace("8788", str(port))
+        updated_content = content.replace(b"8788", str(port).encode("utf-8"))
+        if updated_content == content:
+            return
 
-        # Save the original content
-        with open(config_path + ".original", "w") as f:
-            f.write(content)
+        # Save the original content and write the updated content
+        cls._orig_config_bytes = content
+        config_path.write_bytes(updated_content)
 
-        # Write the updated content
-        with open(config_path, "w") as f:
-            f.write(updated_content)
-
-    @staticmethod
-    def _restore_test_config():
+    @classmethod
+    def _restore_test_config(cls):
         """Restore the original test config file."""
-        config_path = os.path.join("tests", "data", "test_config.toml")
-        original_path = config_path + ".original"
-
-        if os.path.exists(original_path):
-            with open(original_path, "r") as f:
-                original_content = f.read()
-
-            with open(config_path, "w") as f:
-                f.write(original_content)
-
-            os.remove(original_path)
+        if cls._orig_config_bytes is not None:
+            Path("tests", "data", "test_config.toml").write_bytes(
+                cls._orig_config_bytes
+            )
+            cls._orig_config_bytes = None
 
     @patch("src.gtfs_rt_aggregator.pipeline.run_pipeline")
     def test_cli_with_valid_config(self, mock_run_pipeline):
@@ -7,6 +7,7 @@ from io import BytesIO
 from unittest.mock import patch, MagicMock
 
 import pandas as pd
+import pyarrow as pa
 import pytz
 
 from src.gtfs_rt_aggregator.aggregator.service import AggregatorService
@@ -18,27 +19,23 @@ from src.gtfs_rt_aggregator.config.models import (
 )
 from src.gtfs_rt_aggregator.fetcher.service import FetcherService
 from src.gtfs_rt_aggregator.pipeline import GtfsRtPipeline
-from tests.mocks import MockStorageInterface, MockServerManager
+from tests.mocks import (
+    MockStorageInterface,
+    ParquetAssertionsMixin,
+    get_mock_server,
+)
 
 
-class TestFullPipeline(unittest.TestCase):
+class TestFullPipeline(ParquetAssertionsMixin, unittest.TestCase):
     """Test the full GTFS-RT pipeline from fetching to aggregation."""
 
     @classmethod
     def setUpClass(cls):
-        """Start the mock server before tests."""
-        cls.server_manager = MockServerManager()
-        success = cls.server_manager.start()
-        if not success:
-            raise RuntimeError("Could not start mock server")
-        # Get the actual port that was used
+        """Set up the shared mock server."""
+        cls.server_manager = get_mock_server()
+        # Get the actual port that was assigned
         cls.mock_server_port = cls.server_manager.port
 
-    @classmethod
-    def tearDownClass(cls):
-        """Stop the mock server after tests."""
-        cls.server_manager.stop()
-
     def setUp(self):
         """Set up test configuration and storage."""
         # Create mock storage
@@ -98,7 +95,9 @@ class TestFullPipeline(unittest.TestCase):
                 timezone="UTC",
             )
 
-        # Verify that individual files were created
+        # Verify that individual files were created, keeping the first one of
+        # each service type as a template for the additional fetches below
+        templates = {}
         for service_type in ["VehiclePosition", "TripUpdate", "Alert"]:
             files = self.storage.list_files(
                 f"{self.provider_name}/{service_type}/individual"
@@ -107,19 +106,25 @@ class TestFullPipeline(unittest.TestCase):
                 len(files) > 0, f"No individual files created for {service_type}"
             )
 
-            # Verify that the files can be read as DataFrames
+            # Verify that the files are non-empty parquet files
             for file_path in files:
-                data_bytes = self.storage.read_bytes(file_path)
-                df = pd.read_parquet(BytesIO(data_bytes))
-                self.assertFalse(df.empty)
-                self.assertIn("fetchTime", df.columns)
+                data = self.storage.get_bytes(file_path)
+                self.assert_parquet_nonempty_with_column(data, "fetchTime")
+                templates.setdefault(service_type, data)
                 # The actual data doesn't have a provider column, so we don't test for it
 
         # We'll create a few more timestamps for testing aggregation
         now = datetime.now(pytz.UTC)
         now_date = now.strftime("%Y-%m-%d")
 
+        # Decode each template only once
+        templates = {
+            service_type: pd.read_parquet(pa.BufferReader(template_data))
+            for service_type, template_data in templates.items()
+        }
+
         # Create additional fetches with different timestamps
+        buffer = BytesIO()
         for i in range(1, 3):  # Create 2 more files for each type
             for api in self.config.providers[0].apis:
                 for service_type in api.services:
@@ -128,21 +133,15 @@ class TestFullPipeline(unittest.TestCase):
                     timestamp_str = timestamp.strftime("%Y-%m-%d_%H-%M-%S")
                     file_path = f"{self.provider_name}/{service_type}/individual/individual_{timestamp_str}.parquet"
 
-                    # Use the first file we created earlier as a template
-                    template_path = self.storage.list_files(
-                        f"{self.provider_name}/{service_type}/individual"
-                    )[0]
-                    template_data = self.storage.read_bytes(template_path)
-
-                    # Read the template as DataFrame, update timestamps, and save
-                    df = pd.read_parquet(BytesIO(template_data))
+                    # Update the template timestamps
+                    df = templates[service_type].copy(deep=False)
                     df["fetch_time"] = timestamp
 
                     # Convert back to bytes and save
-                    buffer = BytesIO()
-                    df.to_parquet(buffer)
                     buffer.seek(0)
-                    self.storage.save_bytes(buffer.read(), file_path)
+                    buffer.truncate(0)
+                    df.to_parquet(buffer)
+                    self.storage.save_bytes(buffer.getvalue(), file_path)
 
         # 3. Run the aggregator service
         aggregator = AggregatorService(self.config, self.storages)
@@ -167,13 +166,12 @@ class TestFullPipeline(unittest.TestCase):
                 f"No hourly aggregated files created for {service_type}",
             )
 
-            # Verify that the aggregated files can be read as DataFrames
+            # Verify each aggregated file from its parquet footer
             for file_path in aggregated_files:
-                data_bytes = self.storage.read_bytes(file_path)
-                df = pd.read_parquet(BytesIO(data_bytes))
-                self.assertFalse(df.empty)
-                self.assertIn("fetch_time", df.columns)
-                # The actual data might not have a provider column, so we don't test for it
+                self.assert_parquet_nonempty_with_column(
+                    self.storage.get_bytes(file_path), "fetch_time"
+                )
+            # The actual data might not have a provider column, so we don't test for it
 
     def test_pipeline_integration(self):
         """
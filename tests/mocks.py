@@ -1,15 +1,30 @@
+import atexit
+import bisect
 import fnmatch
 import http.server
+import io
 import os
 import re
+import socket
 import socketserver
 import threading
-import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
 
 from src.gtfs_rt_aggregator.storage.base import StorageInterface
 
+# Set MOCK_SERVER_DEBUG to get start/stop messages from the mock server
+MOCK_SERVER_DEBUG = bool(os.environ.get("MOCK_SERVER_DEBUG"))
+
+# Characters that make a list_files pattern more than a literal substring
+REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+
 
 class MockStorageInterface(StorageInterface):
     """Mock storage for testing."""
@@ -17,8 +32,12 @@ class MockStorageInterface(StorageInterface):
     def __init__(self):
         super().__init__()
         self.saved_data = {}
+        # Saved paths in sorted order, for prefix lookups in list_files
+        self._sorted_paths: List[str] = []
 
     def save_bytes(self, data: bytes, path: str) -> str:
+        if path not in self.saved_data:
+            bisect.insort(self._sorted_paths, path)
         self.saved_data[path] = data
         return path
 
@@ -28,30 +47,42 @@ class MockStorageInterface(StorageInterface):
         return self.saved_data.get(path)
 
     def list_files(self, directory: str, pattern: Optional[str] = None) -> List[str]:
-        files = []
-        for path in self.saved_data.keys():
-            if path.startswith(directory):
-                if pattern is None:
-                    files.append(path)
-                elif "*" in pattern:
-                    # Handle glob patterns
-                    if fnmatch.fnmatch(os.path.basename(path), pattern):
-                        files.append(path)
-                elif re.search(pattern, path):
-                    # Handle regex patterns
-                    files.append(path)
-        return files
+        # Only visit the paths under the directory
+        start = bisect.bisect_left(self._sorted_paths, directory)
+        end = start
+        while end < len(self._sorted_paths) and self._sorted_paths[end].startswith(
+            directory
+        ):
+            end += 1
+        paths = self._sorted_paths[start:end]
+        if pattern is None:
+            return paths
+
+        if "*" in pattern:
+            # Handle glob patterns, matched against the file name
+            compiled = re.compile(fnmatch.translate(pattern))
+            return [p for p in paths if compiled.match(os.path.basename(p))]
+
+        if not REGEX_SPECIAL_CHARS.intersection(pattern):
+            # Literal patterns only need a substring check
+            return [p for p in paths if pattern in p]
+
+        # Handle regex patterns, matched against the full path
+        compiled = re.compile(pattern)
+        return [p for p in paths if compiled.search(p)]
 
     def delete_file(self, path: str) -> bool:
         if path in self.saved_data:
             del self.saved_data[path]
+            del self._sorted_paths[bisect.bisect_left(self._sorted_paths, path)]
             return True
         return False
 
     def rename_file(self, source_path: str, target_path: str) -> bool:
         if source_path in self.saved_data:
-            self.saved_data[target_path] = self.saved_data[source_path]
-            del self.saved_data[source_path]
+            data = self.saved_data[source_path]
+            self.delete_file(source_path)
+            self.save_bytes(data, target_path)
             return True
         return False
 
@@ -79,81 +110,183 @@ class MockGtfsRtServer(http.server.SimpleHTTPRequestHandler):
         "/vehicle_positions": "vehicle_positions.pb",
     }
 
-    def do_GET(self):
-        # Get the file path for the requested endpoint
-        test_file = self.ENDPOINT_MAPPING.get(self.path)
+    # Payloads by endpoint, read from disk the first time each one is requested
+    _CACHE: Dict[str, bytes] = {}
+
+    @classmethod
+    def get_data(cls, path: str) -> Optional[bytes]:
+        """Return the cached test data for an endpoint path, or None if unknown."""
+        data = cls._CACHE.get(path)
+        if data is None:
+            test_file = cls.ENDPOINT_MAPPING.get(path)
+            if not test_file:
+                return None
+            data = cls._CACHE.setdefault(
+                path, (Path(__file__).parent / "data" / test_file).read_bytes()
+            )
+        return data
 
-        if test_file:
+    def do_GET(self):
+        try:
+            data = self.get_data(self.path)
+        except FileNotFoundError:
+            self._write_response(
+                404, f"Test file not found: {self.path}".encode("utf-8")
+            )
+            return
+
+        if data is not None:
             # Return the file's contents
-            self.send_response(200)
-            self.send_header("Content-type", "application/x-protobuf")
-
-            test_file_path = str(Path(__file__).parent / "data" / test_file)
-
-            try:
-                with open(test_file_path, "rb") as f:
-                    data = f.read()
-
-                self.send_header("Content-Length", str(len(data)))
-                self.end_headers()
-                self.wfile.write(data)
-            except FileNotFoundError:
-                self.send_response(404)
-                self.end_headers()
-                self.wfile.write(f"Test file not found: {test_file}".encode("utf-8"))
+            self._write_response(200, data, "application/x-protobuf")
         else:
             # Return 404 for unknown endpoints
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(b"Not Found")
+            self._write_response(404, b"Not Found")
+
+    def _write_response(
+        self, code: int, body: bytes, content_type: Optional[str] = None
+    ):
+        """Send the status line, headers and body in a single write."""
+        headers = [f"{self.protocol_version} {code} {self.responses[code][0]}"]
+        if content_type:
+            headers.append(f"Content-type: {content_type}")
+        headers.append(f"Content-Length: {len(body)}")
+        self.wfile.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
 
     def log_message(self, format, *args):
         """Suppress log messages to prevent cluttering test output."""
         pass
 
 
+class MockHttpServer(http.server.ThreadingHTTPServer):
+    """Threaded HTTP server tuned for serving the mock feeds on localhost."""
+
+    allow_reuse_address = True
+
+    def server_bind(self):
+        # Skip HTTPServer's fully qualified domain name lookup, not needed locally
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = self.server_address[:2]
+
+    def get_request(self):
+        # Disable Nagle's algorithm so small responses are not delayed
+        request, client_address = super().get_request()
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return request, client_address
+
+
+class MockGtfsRtAdapter(BaseAdapter):
+    """Requests transport adapter that serves GTFS-RT test data without a socket."""
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.encoding = None
+        # Behave like a response whose body has been read in full
+        response._content_consumed = True
+
+        try:
+            data = MockGtfsRtServer.get_data(urlsplit(request.url).path)
+        except FileNotFoundError:
+            data = None
+
+        if data is not None:
+            response.status_code = 200
+            response.reason = "OK"
+            response._content = data
+            response.raw = io.BytesIO(data)
+            response.headers = CaseInsensitiveDict(
+                {
+                    "Content-type": "application/x-protobuf",
+                    "Content-Length": str(len(data)),
+                }
+            )
+        else:
+            response.status_code = 404
+            response.reason = "Not Found"
+            response._content = b"Not Found"
+            response.raw = io.BytesIO(response._content)
+            response.headers = CaseInsensitiveDict()
+
+        return response
+
+    def close(self):
+        pass
+
+
+class MockTransportManager:
+    """
+    Drop-in replacement for MockServerManager that serves requests in-process.
+
+    Every requests session gets the MockGtfsRtAdapter for URLs pointing at
+    localhost on the configured port, so no server thread or socket is needed.
+    """
+
+    def __init__(self, port=None):
+        self.port = port or int(os.environ.get("MOCKUP_SERVER_PORT", 8788))
+        self.adapter = MockGtfsRtAdapter()
+        self._patcher = None
+
+    def start(self):
+        """Route requests for the mock server URL to the in-process adapter."""
+        if self._patcher:
+            return False
+
+        prefix = f"http://localhost:{self.port}/"
+        adapter = self.adapter
+        get_adapter = requests.Session.get_adapter
+
+        def _get_adapter(session, url):
+            if url.startswith(prefix):
+                return adapter
+            return get_adapter(session, url)
+
+        self._patcher = patch.object(requests.Session, "get_adapter", _get_adapter)
+        self._patcher.start()
+        return True
+
+    def stop(self):
+        """Restore the default requests transport."""
+        if self._patcher:
+            self._patcher.stop()
+            self._patcher = None
+
+
 class MockServerManager:
     """Helper class to manage mock server instances for tests."""
 
     def __init__(self, port=None):
-        self.port = port or int(os.environ.get("MOCKUP_SERVER_PORT", 8788))
+        # Without an explicit port, the OS assigns a free one when starting
+        env_port = os.environ.get("MOCKUP_SERVER_PORT")
+        self.port = port or (int(env_port) if env_port else None)
         self.server = None
         self.server_thread = None
 
     def start(self, handler_class=MockGtfsRtServer):
-        """Start the mock server on the specified port or find an available port."""
-        # If no specific port is requested, try to find an available port
+        """Start the mock server on the specified port or on a free one."""
         if not self.server:
-            # Try the specified port first
-            success = self._try_start_server(self.port, handler_class)
-
-            # If that fails, try to find another port
-            if (
-                not success and self.port == 8788
-            ):  # Only search if using the default port
-                for port in range(8789, 8889):
-                    success = self._try_start_server(port, handler_class)
-                    if success:
-                        self.port = port
-                        break
-
-            return success
+            return self._try_start_server(self.port or 0, handler_class)
         return False
 
     def _try_start_server(self, port, handler_class):
-        """Try to start the server on the specified port."""
+        """Try to start the server on the specified port, 0 picks a free one."""
         try:
-            self.server = socketserver.TCPServer(("localhost", port), handler_class)
+            self.server = MockHttpServer(("localhost", port), handler_class)
+            # Get the actual port that was bound
+            self.port = self.server.server_address[1]
             self.server_thread = threading.Thread(target=self.server.serve_forever)
             self.server_thread.daemon = True
             self.server_thread.start()
 
-            # Wait for server to start
-            time.sleep(0.5)
-            print(f"Mock server started on port {port}")
+            # The constructor has already bound and activated the socket, so
+            # the server accepts connections as soon as the thread is running
+            if MOCK_SERVER_DEBUG:
+                print(f"Mock server started on port {self.port}")
             return True
         except OSError:
-            print(f"Failed to start mock server on port {port}")
+            self.server = None
+            if MOCK_SERVER_DEBUG:
+                print(f"Failed to start mock server on port {port}")
             return False
 
     def stop(self):
@@ -162,7 +295,45 @@ class MockServerManager:
             self.server.shutdown()
             self.server.server_close()
             self.server_thread.join(1)
-            print("Mock server stopped")
+            if MOCK_SERVER_DEBUG:
+                print("Mock server stopped")
+
+
+# Mock server shared by every test in the process, see get_mock_server
+_shared_server = None
+
+
+def get_mock_server():
+    """
+    Return the mock server shared by every test in the process, starting it on first use.
+
+    The feeds are served in-process unless MOCK_SERVER_REAL_HTTP is set, in
+    which case a local HTTP server is started. The server is stopped at exit.
+    """
+    global _shared_server
+    if _shared_server is None:
+        if os.environ.get("MOCK_SERVER_REAL_HTTP"):
+            server_manager = MockServerManager()
+        else:
+            server_manager = MockTransportManager()
+        if not server_manager.start():
+            raise RuntimeError("Could not start mock server")
+        atexit.register(server_manager.stop)
+        _shared_server = server_manager
+    return _shared_server
+
+
+class ParquetAssertionsMixin:
+    """Assertions on in-memory parquet files for unittest.TestCase subclasses."""
+
+    def assert_parquet_nonempty_with_column(self, data: bytes, column: str):
+        """Check row count and columns from the parquet footer, without decoding the data."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(pa.BufferReader(data))
+        self.assertGreater(parquet_file.metadata.num_rows, 0)
+        self.assertIn(column, parquet_file.schema_arrow.names)
 
 
 def create_mock_parquet_files(
@@ -187,13 +358,16 @@ def create_mock_parquet_files(
     """
     # Import here to avoid circular imports
     from datetime import datetime, timedelta
-    import pandas as pd
-    from io import BytesIO
+    import pyarrow as pa
+    import pyarrow.parquet as pq
 
     # Parse base time
     base_time = datetime.fromisoformat(base_time_str)
     created_files = []
 
+    # Inferred from the first table and reused for the following ones
+    schema = None
+
     for i in range(count):
         # Create timestamp for this file
         timestamp = base_time + timedelta(minutes=i * 5)
@@ -204,22 +378,21 @@ def create_mock_parquet_files(
         # Create file path with the 'individual_' prefix
         file_path = f"{provider_name}/{service_type}/individual/individual_{timestamp_str}.parquet"
 
-        # Create a simple DataFrame
-        df = pd.DataFrame(
+        # Create a simple table, provider and service type are already in the path
+        table = pa.Table.from_pydict(
             {
                 "id": [f"test_id_{i}_{j}" for j in range(5)],
-                "fetch_time": [timestamp for _ in range(5)],
-                "provider": [provider_name for _ in range(5)],
-                "service_type": [service_type for _ in range(5)],
-                "value": [j for j in range(5)],
-            }
+                "fetch_time": [timestamp] * 5,
+                "value": list(range(5)),
+            },
+            schema=schema,
         )
+        schema = table.schema
 
-        # Save to storage
-        buffer = BytesIO()
-        df.to_parquet(buffer)
-        buffer.seek(0)
-        storage.save_bytes(buffer.read(), file_path)
+        # Save to storage, compression is not worth the CPU time for test fixtures
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink, compression="none")
+        storage.save_bytes(sink.getvalue().to_pybytes(), file_path)
         created_files.append(file_path)
 
     return created_files
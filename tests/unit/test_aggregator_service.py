@@ -17,30 +17,28 @@ from tests.mocks import MockStorageInterface, create_mock_parquet_files
 class TestAggregatorService(unittest.TestCase):
     """Test cases for the AggregatorService."""
 
-    def setUp(self):
-        """Set up test environment."""
-        # Create a mock storage and configuration
-        self.storage = MockStorageInterface()
-
+    @classmethod
+    def setUpClass(cls):
+        """Set up the configuration shared by all tests."""
         # Mock configuration
-        self.provider_name = "test_provider"
-        self.service_type = "VehiclePosition"
-        self.frequency_minutes = 15
-        self.timezone_str = "UTC"
-        self.timezone = pytz.timezone(self.timezone_str)
+        cls.provider_name = "test_provider"
+        cls.service_type = "VehiclePosition"
+        cls.frequency_minutes = 15
+        cls.timezone_str = "UTC"
+        cls.timezone = pytz.timezone(cls.timezone_str)
 
-        self.config = GtfsRtConfig(
+        cls.config = GtfsRtConfig(
             storage=StorageConfig(type="filesystem", params={}),
             providers=[
                 ProviderConfig(
-                    name=self.provider_name,
-                    timezone=self.timezone_str,
+                    name=cls.provider_name,
+                    timezone=cls.timezone_str,
                     apis=[
                         ApiConfig(
                             url="http://localhost:8788/vehicle_positions",
-                            services=[self.service_type],
+                            services=[cls.service_type],
                             refresh_seconds=60,
-                            frequency_minutes=self.frequency_minutes,
+                            frequency_minutes=cls.frequency_minutes,
                             check_interval_seconds=300,
                         )
                     ],
@@ -48,6 +46,11 @@ class TestAggregatorService(unittest.TestCase):
             ],
         )
 
+    def setUp(self):
+        """Set up test environment."""
+        # Create a mock storage, it holds the state mutated by the tests
+        self.storage = MockStorageInterface()
+
         # Create the aggregator service with our mock storage
         # Note: we need to add both provider-specific and global storage
         self.aggregator = AggregatorService(
@@ -86,6 +89,63 @@ class TestAggregatorService(unittest.TestCase):
         for group_time, files in groups.items():
             self.assertEqual(len(files), 15)
 
+    def test_group_files_by_time_skips_unparseable_names(self):
+        """Test that files without a datetime in their name are logged and skipped."""
+        directory = f"{self.provider_name}/{self.service_type}/individual"
+        filenames = [
+            f"{directory}/individual_2023-01-01_12-05-00.parquet",
+            f"{directory}/not_a_timestamp.parquet",
+        ]
+
+        with self.assertLogs(self.aggregator.logger, level="WARNING") as logs:
+            groups = self.aggregator._group_files_by_time(
+                filenames, self.frequency_minutes, self.timezone
+            )
+
+        # Only the valid file should be grouped
+        self.assertEqual(list(groups.values()), [filenames[:1]])
+        self.assertTrue(
+            any("not_a_timestamp.parquet" in line for line in logs.output),
+            logs.output,
+        )
+
+    def test_group_files_by_time_plain_names(self):
+        """Test that file names without the individual_ prefix are grouped."""
+        directory = f"{self.provider_name}/{self.service_type}/individual"
+        filenames = [
+            f"{directory}/2023-01-01_12-05-00.parquet",
+            f"{directory}/individual_2023-01-01_12-10-00.parquet",
+            f"{directory}/2023-01-01_12-20-00.parquet",
+        ]
+
+        groups = self.aggregator._group_files_by_time(
+            filenames, self.frequency_minutes, self.timezone
+        )
+
+        self.assertEqual(
+            groups,
+            {
+                self.timezone.localize(datetime(2023, 1, 1, 12, 0)): filenames[:2],
+                self.timezone.localize(datetime(2023, 1, 1, 12, 15)): filenames[2:],
+            },
+        )
+
+    def test_group_files_by_time_dst_gap(self):
+        """Test that a group starting in a DST gap matches _get_rounded_time."""
+        timezone = pytz.timezone("Europe/Brussels")
+        directory = f"{self.provider_name}/{self.service_type}/individual"
+        # 02:00 does not exist on that day, the clocks go from 02:00 to 03:00
+        filenames = [f"{directory}/individual_2025-03-30_03-10-00.parquet"]
+
+        groups = self.aggregator._group_files_by_time(filenames, 120, timezone)
+
+        expected_time = self.aggregator._get_rounded_time(
+            timezone.localize(datetime(2025, 3, 30, 3, 10)), 120
+        )
+        self.assertEqual(groups, {expected_time: filenames})
+        group_time = next(iter(groups))
+        self.assertEqual(group_time.utcoffset(), timedelta(hours=2))
+
     def test_aggregate_service_type(self):
         """Test _aggregate_service_type method."""
         # First, create a few mock files
@@ -101,10 +161,15 @@ class TestAggregatorService(unittest.TestCase):
             patch.object(self.aggregator, "_aggregate_files") as mock_aggregate,
         ):
 
-            # Set up the mock to return a dictionary with one timestamp and 5 files
+            # Set up the mock to return a group with 5 files, followed by a group
+            # from the next period
             fake_timestamp = base_time
             fake_files = [f"file{i}.parquet" for i in range(5)]
-            mock_group.return_value = {fake_timestamp: fake_files}
+            next_timestamp = base_time + timedelta(minutes=self.frequency_minutes)
+            mock_group.return_value = {
+                fake_timestamp: fake_files,
+                next_timestamp: ["file5.parquet"],
+            }
 
             # Run aggregation
             self.aggregator._aggregate_service_type(
@@ -119,6 +184,10 @@ class TestAggregatorService(unittest.TestCase):
             mock_group.assert_called_once()
             self.assertTrue(mock_aggregate.called)
 
+            # The latest group has no files from its next period yet, so it is skipped
+            mock_aggregate.assert_called_once()
+            self.assertEqual(mock_aggregate.call_args.kwargs["files"], fake_files)
+
     def test_run_once(self):
         """Test run_once method with mock data."""
         # Mock the _aggregate_service_type method to avoid the actual aggregation
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.gtfs_rt_aggregator.config.loader import (
+    clear_config_cache,
+    load_config_from_toml,
+    load_config_from_toml_file,
+)
+
+# Minimal configuration, written by the tests instead of sharing tests/data/test_config.toml
+CONFIG_TEMPLATE = """
+[storage]
+type = "filesystem"
+
+[[providers]]
+name = "{provider_name}"
+
+[[providers.apis]]
+url = "http://localhost:8788/alerts"
+services = ["Alert"]
+"""
+
+
+class TestConfigLoader(unittest.TestCase):
+    """Test cases for the TOML configuration loader."""
+
+    def setUp(self):
+        """Write a test config to a temporary file."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.tmp_dir, "config.toml")
+        self._write_config("test_provider")
+        clear_config_cache()
+
+    def tearDown(self):
+        clear_config_cache()
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_config(self, provider_name: str):
+        """Write the test config for the given provider name."""
+        with open(self.config_path, "w") as f:
+            f.write(CONFIG_TEMPLATE.format(provider_name=provider_name))
+
+    def test_load_config_is_cached(self):
+        """Test that loading an unchanged file parses it only once."""
+        with patch(
+            "src.gtfs_rt_aggregator.config.loader.load_config_from_toml_file",
+            wraps=load_config_from_toml_file,
+        ) as mock_load:
+            config = load_config_from_toml(self.config_path)
+            self.assertEqual(load_config_from_toml(self.config_path), config)
+
+        mock_load.assert_called_once()
+
+    def test_load_config_returns_copies(self):
+        """Test that mutating a loaded configuration does not affect later loads."""
+        config = load_config_from_toml(self.config_path)
+        config.providers[0].name = "mutated_provider"
+
+        config = load_config_from_toml(self.config_path)
+        self.assertEqual(config.providers[0].name, "test_provider")
+
+    def test_load_config_reloads_modified_file(self):
+        """Test that a modified file is parsed again."""
+        config = load_config_from_toml(self.config_path)
+        self.assertEqual(config.providers[0].name, "test_provider")
+
+        self._write_config("other_provider")
+
+        config = load_config_from_toml(self.config_path)
+        self.assertEqual(config.providers[0].name, "other_provider")
+
+
+if __name__ == "__main__":
+    unittest.main()
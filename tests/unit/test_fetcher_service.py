@@ -1,8 +1,6 @@
-import os
+import re
 import unittest
-from io import BytesIO
-
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from src.gtfs_rt_aggregator.config.models import (
     GtfsRtConfig,
@@ -11,38 +9,48 @@ from src.gtfs_rt_aggregator.config.models import (
     StorageConfig,
 )
 from src.gtfs_rt_aggregator.fetcher.service import FetcherService
-from tests.mocks import MockStorageInterface, MockServerManager
-
-# Start with a base port, but the actual port may change
-BASE_PORT = int(os.environ.get("MOCKUP_SERVER_PORT", 8788))
+from tests.mocks import (
+    MockStorageInterface,
+    ParquetAssertionsMixin,
+    get_mock_server,
+)
 
 
-class TestFetcherService(unittest.TestCase):
+class TestFetcherService(ParquetAssertionsMixin, unittest.TestCase):
     """Tests for the FetcherService."""
 
+    # Mock server endpoints and the service type each one provides
+    ENDPOINTS = [
+        ("alerts", "Alert"),
+        ("trip_updates", "TripUpdate"),
+        ("vehicle_positions", "VehiclePosition"),
+    ]
+
+    # Expected format of the individual files saved by the fetcher
+    PATH_RE = re.compile(
+        r"^test_provider/(Alert|TripUpdate|VehiclePosition)/individual/[^/]+\.parquet$"
+    )
+
     @classmethod
     def setUpClass(cls):
-        """Start the mock server before tests."""
-        cls.server_manager = MockServerManager(BASE_PORT)
-        success = cls.server_manager.start()
-        if not success:
-            raise RuntimeError("Could not start mock server")
-        # Get the actual port that was used (may be different from BASE_PORT)
+        """Set up the shared mock server, configuration and service."""
+        cls.server_manager = get_mock_server()
+        # Get the actual port that was assigned
         cls.mock_server_port = cls.server_manager.port
 
-    @classmethod
-    def tearDownClass(cls):
-        """Stop the mock server after tests."""
-        cls.server_manager.stop()
+        # Build the endpoint URLs once, shared by the config and the tests
+        base = f"http://localhost:{cls.mock_server_port}"
+        cls.urls = {
+            service_type: f"{base}/{endpoint}"
+            for endpoint, service_type in cls.ENDPOINTS
+        }
 
-    def setUp(self):
-        """Set up test configuration and storage."""
         # Create mock storage
-        self.storage = MockStorageInterface()
-        self.storages = {"global": self.storage}
+        cls.storage = MockStorageInterface()
+        cls.storages = {"global": cls.storage}
 
         # Create test configuration
-        self.config = GtfsRtConfig(
+        cls.config = GtfsRtConfig(
             storage=StorageConfig(type="filesystem", params={}),
             providers=[
                 ProviderConfig(
@@ -50,34 +58,33 @@ class TestFetcherService(unittest.TestCase):
                     timezone="UTC",
                     apis=[
                         ApiConfig(
-                            url=f"http://localhost:{self.__class__.mock_server_port}/alerts",
-                            refresh_seconds=60,
-                            services=["Alert"],
-                        ),
-                        ApiConfig(
-                            url=f"http://localhost:{self.__class__.mock_server_port}/trip_updates",
-                            refresh_seconds=60,
-                            services=["TripUpdate"],
-                        ),
-                        ApiConfig(
-                            url=f"http://localhost:{self.__class__.mock_server_port}/vehicle_positions",
+                            url=cls.urls[service_type],
                             refresh_seconds=60,
-                            services=["VehiclePosition"],
-                        ),
+                            services=[service_type],
+                        )
+                        for _, service_type in cls.ENDPOINTS
                     ],
                 )
             ],
         )
 
         # Create the fetcher service
-        self.fetcher_service = FetcherService(self.config, self.storages)
+        cls.fetcher_service = FetcherService(cls.config, cls.storages)
+
+    def setUp(self):
+        """Start each test with empty storage."""
+        self.storage = self.storages["global"] = MockStorageInterface()
 
     def test_get_scheduling(self):
         """Test that scheduling is correctly generated."""
         schedules = self.fetcher_service.get_scheduling()
 
-        # Should have 3 schedules (one for each API)
-        self.assertEqual(len(schedules), 3)
+        # Should have one schedule for each API
+        self.assertEqual(len(schedules), len(self.ENDPOINTS))
+        self.assertEqual(
+            sorted(schedule[3]["url"] for schedule in schedules),
+            sorted(self.urls.values()),
+        )
 
         # Each schedule should be a tuple with 4 elements
         for schedule in schedules:
@@ -99,116 +106,42 @@ class TestFetcherService(unittest.TestCase):
             self.assertIn("service_types", schedule[3])
             self.assertIn("timezone", schedule[3])
 
-    def test_run_once_alerts(self):
-        """Test fetching alerts."""
-        # Clear storage before test
-        self.storage.saved_data = {}
-
-        # Run the fetch job for alerts
-        self.fetcher_service.run_once(
-            provider_name="test_provider",
-            url=f"http://localhost:{self.__class__.mock_server_port}/alerts",
-            service_types=["Alert"],
-            timezone="UTC",
-        )
-
-        # Check that data was saved to storage
-        saved_paths = self.storage.list_paths()
-
-        # Should have one saved file
-        self.assertEqual(len(saved_paths), 1)
-
-        # Path should match the expected format
-        path = saved_paths[0]
-        self.assertTrue(
-            path.startswith("test_provider/Alert/individual/"),
-            f"Path format incorrect: {path}",
-        )
-        self.assertTrue(path.endswith(".parquet"), f"File extension incorrect: {path}")
-
-        # Verify the saved data can be loaded as a DataFrame
-        data_bytes = self.storage.get_bytes(path)
-        df = pd.read_parquet(BytesIO(data_bytes))
-
-        # Should not be empty
-        self.assertFalse(df.empty)
-
-        # Should have the expected columns for alerts
-        self.assertIn("fetchTime", df.columns)
-
-    def test_run_once_trip_updates(self):
-        """Test fetching trip updates."""
-        # Clear storage before test
-        self.storage.saved_data = {}
-
-        # Run the fetch job for trip updates
-        self.fetcher_service.run_once(
-            provider_name="test_provider",
-            url=f"http://localhost:{self.__class__.mock_server_port}/trip_updates",
-            service_types=["TripUpdate"],
-            timezone="UTC",
-        )
-
-        # Check that data was saved to storage
-        saved_paths = self.storage.list_paths()
-
-        # Should have one saved file
-        self.assertEqual(len(saved_paths), 1)
-
-        # Path should match the expected format
-        path = saved_paths[0]
-        self.assertTrue(
-            path.startswith("test_provider/TripUpdate/individual/"),
-            f"Path format incorrect: {path}",
-        )
-        self.assertTrue(path.endswith(".parquet"), f"File extension incorrect: {path}")
-
-        # Verify the saved data can be loaded as a DataFrame
-        data_bytes = self.storage.get_bytes(path)
-        df = pd.read_parquet(BytesIO(data_bytes))
-
-        # Should not be empty
-        self.assertFalse(df.empty)
-
-        # Should have the expected columns for trip updates
-        self.assertIn("fetchTime", df.columns)
-
-    def test_run_once_vehicle_positions(self):
-        """Test fetching vehicle positions."""
-        # Clear storage before test
-        self.storage.saved_data = {}
-
-        # Run the fetch job for vehicle positions
-        self.fetcher_service.run_once(
-            provider_name="test_provider",
-            url=f"http://localhost:{self.__class__.mock_server_port}/vehicle_positions",
-            service_types=["VehiclePosition"],
-            timezone="UTC",
-        )
+    def test_run_once_all(self):
+        """Test fetching alerts, trip updates and vehicle positions concurrently."""
+        # Run the fetch jobs for all endpoints at once, each fetch uses its own session
+        with ThreadPoolExecutor(max_workers=len(self.ENDPOINTS)) as executor:
+            futures = [
+                executor.submit(
+                    self.fetcher_service.run_once,
+                    provider_name="test_provider",
+                    url=self.urls[service_type],
+                    service_types=[service_type],
+                    timezone="UTC",
+                )
+                for _, service_type in self.ENDPOINTS
+            ]
+            wait(futures)
 
-        # Check that data was saved to storage
-        saved_paths = self.storage.list_paths()
+        for future in futures:
+            future.result()
 
-        # Should have one saved file
-        self.assertEqual(len(saved_paths), 1)
+        # Should have one saved file per endpoint
+        self.assertEqual(len(self.storage.saved_data), len(self.ENDPOINTS))
+        saved_paths = {path.split("/")[1]: path for path in self.storage.saved_data}
 
-        # Path should match the expected format
-        path = saved_paths[0]
-        self.assertTrue(
-            path.startswith("test_provider/VehiclePosition/individual/"),
-            f"Path format incorrect: {path}",
-        )
-        self.assertTrue(path.endswith(".parquet"), f"File extension incorrect: {path}")
+        for _, service_type in self.ENDPOINTS:
+            with self.subTest(service=service_type):
+                # Check that data was saved to storage
+                path = saved_paths.get(service_type)
+                self.assertIsNotNone(path, f"No file saved for {service_type}")
 
-        # Verify the saved data can be loaded as a DataFrame
-        data_bytes = self.storage.get_bytes(path)
-        df = pd.read_parquet(BytesIO(data_bytes))
+                # Path should match the expected format
+                self.assertRegex(path, self.PATH_RE)
 
-        # Should not be empty
-        self.assertFalse(df.empty)
-
-        # Should have the expected columns for vehicle positions
-        self.assertIn("fetchTime", df.columns)
+                # Verify the saved data is a non-empty parquet file with the expected columns
+                self.assert_parquet_nonempty_with_column(
+                    self.storage.get_bytes(path), "fetchTime"
+                )
 
 
 if __name__ == "__main__":